@@ -1,11 +1,14 @@
+import functools
+import io
 import time
 import uuid
-from dataclasses import asdict, dataclass
+from dataclasses import dataclass, fields
 from datetime import date, datetime, timedelta
-from typing import List, Optional, Set, Union
+from typing import Any, Callable, Dict, List, Optional, Set, Union
 
 import pandas
 import pyarrow
+import pyarrow.parquet
 from jinja2 import BaseLoader, Environment
 from pydantic import StrictStr
 from pydantic.typing import Literal
@@ -26,7 +29,7 @@ from feast.repo_config import FeastConfigBaseModel, RepoConfig
 try:
     from google.api_core.exceptions import NotFound
     from google.auth.exceptions import DefaultCredentialsError
-    from google.cloud import bigquery
+    from google.cloud import bigquery, bigquery_storage
     from google.cloud.bigquery import Client, Table
 
 except ImportError as e:
@@ -63,11 +66,6 @@ class BigQueryOfflineStore(OfflineStore):
         assert isinstance(data_source, BigQuerySource)
         from_expression = data_source.get_table_query_string()
 
-        partition_by_join_key_string = ", ".join(join_key_columns)
-        if partition_by_join_key_string != "":
-            partition_by_join_key_string = (
-                "PARTITION BY " + partition_by_join_key_string
-            )
         timestamps = [event_timestamp_column]
         if created_timestamp_column:
             timestamps.append(created_timestamp_column)
@@ -75,15 +73,29 @@ class BigQueryOfflineStore(OfflineStore):
         field_string = ", ".join(join_key_columns + feature_name_columns + timestamps)
 
         client = _get_bigquery_client(project=config.offline_store.project_id)
-        query = f"""
-            SELECT {field_string}
+        if join_key_columns:
+            # Picking the latest row of each group with ARRAY_AGG(... LIMIT 1) lets BigQuery keep a
+            # single row per entity while aggregating, instead of sorting the whole source table as
+            # ROW_NUMBER() OVER (PARTITION BY ...) does
+            query = f"""
+            SELECT latest.*
             FROM (
-                SELECT {field_string},
-                ROW_NUMBER() OVER({partition_by_join_key_string} ORDER BY {timestamp_desc_string}) AS _feast_row
-                FROM {from_expression}
-                WHERE {event_timestamp_column} BETWEEN TIMESTAMP('{start_date}') AND TIMESTAMP('{end_date}')
+                SELECT ARRAY_AGG(source ORDER BY {timestamp_desc_string} LIMIT 1)[OFFSET(0)] AS latest
+                FROM (
+                    SELECT {field_string}
+                    FROM {from_expression}
+                    WHERE {event_timestamp_column} BETWEEN TIMESTAMP('{start_date}') AND TIMESTAMP('{end_date}')
+                ) AS source
+                GROUP BY {", ".join(join_key_columns)}
             )
-            WHERE _feast_row = 1
+            """
+        else:
+            query = f"""
+            SELECT {field_string}
+            FROM {from_expression}
+            WHERE {event_timestamp_column} BETWEEN TIMESTAMP('{start_date}') AND TIMESTAMP('{end_date}')
+            ORDER BY {timestamp_desc_string}
+            LIMIT 1
             """
         return BigQueryRetrievalJob(query=query, client=client, config=config)
 
@@ -140,6 +152,8 @@ class BigQueryOfflineStore(OfflineStore):
             full_feature_names=full_feature_names,
         )
 
+        # The query is only submitted once the results are needed. Callers may just want the SQL
+        # (to_sql), a cost estimate (dry run) or an export (to_bigquery), which run their own jobs.
         job = BigQueryRetrievalJob(query=query, client=client, config=config)
         return job
 
@@ -232,11 +246,37 @@ class BigQueryRetrievalJob(RetrievalJob):
         self.query = query
         self.client = client
         self.config = config
+        self._query_job: Optional[bigquery.QueryJob] = None
+
+    def _get_query_job(self) -> bigquery.QueryJob:
+        """
+        Returns the job executing the query, submitting it to BigQuery if that hasn't happened yet.
+        The job is shared by to_df() and to_arrow(), so reading the results twice doesn't run the query twice.
+        """
+        if self._query_job is None:
+            self._query_job = self.client.query(self.query)
+        return self._query_job
+
+    def _read_results(self, read: Callable[[bigquery.QueryJob], Any]) -> Any:
+        """
+        Reads the results of the shared query job with the given function. A job that failed is
+        dropped, so that the next read submits the query again instead of raising the same error.
+        """
+        query_job = self._get_query_job()
+        try:
+            return read(query_job)
+        except Exception:
+            self._query_job = None
+            raise
 
     def to_df(self):
-        # TODO: Ideally only start this job when the user runs "get_historical_features", not when they run to_df()
-        df = self.client.query(self.query).to_dataframe(create_bqstorage_client=True)
-        return df
+        # Let the BigQuery client build the DataFrame so that column dtypes follow its defaults
+        # (e.g. nullable Int64 and boolean columns) instead of those of a plain Arrow conversion
+        return self._read_results(
+            lambda query_job: query_job.to_dataframe(
+                bqstorage_client=_get_bigquery_storage_client()
+            )
+        )
 
     def to_sql(self) -> str:
         """
@@ -278,7 +318,13 @@ class BigQueryRetrievalJob(RetrievalJob):
         return str(job_config.destination)
 
     def to_arrow(self) -> pyarrow.Table:
-        return self.client.query(self.query).to_arrow()
+        # Results are read through the BigQuery Storage API, which downloads the read streams of
+        # unordered query results in parallel
+        return self._read_results(
+            lambda query_job: query_job.to_arrow(
+                bqstorage_client=_get_bigquery_storage_client()
+            )
+        )
 
 
 def block_until_done(client, bq_job):
@@ -316,6 +362,14 @@ class FeatureViewQueryContext:
     entity_selections: List[str]
 
 
+def _query_context_to_dict(context: FeatureViewQueryContext) -> Dict[str, Any]:
+    """
+    Shallow equivalent of `dataclasses.asdict`. The template only reads the context, so
+    there is no need for the deep copy of every field that `asdict` performs.
+    """
+    return {field.name: getattr(context, field.name) for field in fields(context)}
+
+
 def _get_table_id_for_new_entity(
     client: Client, project: str, dataset_name: str, dataset_project: str
 ) -> str:
@@ -351,13 +405,10 @@ def _upload_entity_df_into_bigquery(
         job = client.query(f"CREATE TABLE {table_id} AS ({entity_df})")
         job.result()
     elif isinstance(entity_df, pandas.DataFrame):
-        # Drop the index so that we dont have unnecessary columns
-        entity_df.reset_index(drop=True, inplace=True)
-
-        # Upload the dataframe into BigQuery, creating a temporary table
-        job_config = bigquery.LoadJobConfig()
-        job = client.load_table_from_dataframe(
-            entity_df, table_id, job_config=job_config
+        # Upload the dataframe into BigQuery as Parquet, creating a temporary table
+        job_config = bigquery.LoadJobConfig(source_format=bigquery.SourceFormat.PARQUET)
+        job = client.load_table_from_file(
+            _entity_df_to_parquet(entity_df), table_id, job_config=job_config
         )
         job.result()
     else:
@@ -374,6 +425,29 @@ def _upload_entity_df_into_bigquery(
     return table
 
 
+def _entity_df_to_parquet(entity_df: pandas.DataFrame) -> io.BytesIO:
+    """Serializes an entity dataframe into an in-memory Parquet file ready to be loaded into BigQuery"""
+
+    # Drop the index so that we dont have unnecessary columns
+    table = pyarrow.Table.from_pandas(entity_df, preserve_index=False)
+
+    # Feast treats tz-naive timestamps as UTC. BigQuery would load them as DATETIME rather than
+    # TIMESTAMP, so mark them as UTC explicitly. BigQuery only supports microsecond precision.
+    schema = pyarrow.schema(
+        [
+            field.with_type(pyarrow.timestamp("us", tz=field.type.tz or "UTC"))
+            if pyarrow.types.is_timestamp(field.type)
+            else field
+            for field in table.schema
+        ]
+    )
+    table = table.cast(schema, safe=False)
+
+    buffer = pyarrow.BufferOutputStream()
+    pyarrow.parquet.write_table(table, buffer, compression="snappy")
+    return io.BytesIO(buffer.getvalue().to_pybytes())
+
+
 def get_feature_view_query_context(
     feature_refs: List[str],
     feature_views: List[FeatureView],
@@ -442,10 +516,6 @@ def build_point_in_time_query(
     full_feature_names: bool = False,
 ):
     """Build point-in-time query between each feature view table and the entity dataframe"""
-    template = Environment(loader=BaseLoader()).from_string(
-        source=SINGLE_FEATURE_VIEW_POINT_IN_TIME_JOIN
-    )
-
     # Add additional fields to dict
     template_context = {
         "min_timestamp": min_timestamp,
@@ -455,15 +525,22 @@ def build_point_in_time_query(
         "unique_entity_keys": set(
             [entity for fv in feature_view_query_contexts for entity in fv.entities]
         ),
-        "featureviews": [asdict(context) for context in feature_view_query_contexts],
+        "featureviews": [
+            _query_context_to_dict(context) for context in feature_view_query_contexts
+        ],
         "full_feature_names": full_feature_names,
     }
 
-    query = template.render(template_context)
+    query = _POINT_IN_TIME_JOIN_TEMPLATE.render(template_context)
     return query
 
 
+@functools.lru_cache()
 def _get_bigquery_client(project: Optional[str] = None):
+    """
+    Returns a BigQuery client for the given project. Clients are cached per project so that
+    credential discovery and connection setup only happen once per process.
+    """
     try:
         client = bigquery.Client(project=project)
     except DefaultCredentialsError as e:
@@ -483,6 +560,24 @@ def _get_bigquery_client(project: Optional[str] = None):
     return client
 
 
+@functools.lru_cache()
+def _get_bigquery_storage_client():
+    """
+    Returns a BigQuery Storage read client, cached so that reading results doesn't set up a new
+    gRPC channel for every retrieval job.
+    """
+    try:
+        client = bigquery_storage.BigQueryReadClient()
+    except DefaultCredentialsError as e:
+        raise FeastProviderLoginError(
+            str(e)
+            + '\nIt may be necessary to run "gcloud auth application-default login" if you would like to use your '
+            "local Google Cloud account"
+        )
+
+    return client
+
+
 # TODO: Optimizations
 #   * Use GENERATE_UUID() instead of ROW_NUMBER(), or join on entity columns directly
 #   * Precompute ROW_NUMBER() so that it doesn't have to be recomputed for every query on entity_dataframe
@@ -555,57 +650,23 @@ WITH entity_dataframe AS (
 ),
 
 /*
- 2. If the `created_timestamp_column` has been set, we need to
- deduplicate the data first. This is done by calculating the
- `MAX(created_at_timestamp)` for each event_timestamp.
- We then join the data on the next CTE
-*/
-{% if featureview.created_timestamp_column %}
-{{ featureview.name }}__dedup AS (
-    SELECT
-        entity_row_unique_id,
-        event_timestamp,
-        MAX(created_timestamp) as created_timestamp,
-    FROM {{ featureview.name }}__base
-    GROUP BY entity_row_unique_id, event_timestamp
-),
-{% endif %}
-
-/*
- 3. The data has been filtered during the first CTE "*__base"
- Thus we only need to compute the latest timestamp of each feature.
-*/
-{{ featureview.name }}__latest AS (
-    SELECT
-        entity_row_unique_id,
-        MAX(event_timestamp) AS event_timestamp
-        {% if featureview.created_timestamp_column %}
-            ,ANY_VALUE(created_timestamp) AS created_timestamp
-        {% endif %}
-
-    FROM {{ featureview.name }}__base
-    {% if featureview.created_timestamp_column %}
-        INNER JOIN {{ featureview.name }}__dedup
-        USING (entity_row_unique_id, event_timestamp, created_timestamp)
-    {% endif %}
-
-    GROUP BY entity_row_unique_id
-),
-
-/*
- 4. Once we know the latest value of each feature for a given timestamp,
- we can join again the data back to the original "base" dataset
+ 2. The data has been filtered during the first CTE "*__base"
+ Thus we only need to keep the latest row for each entity row. If the `created_timestamp_column`
+ has been set, it is used to break ties between rows with the same event timestamp.
+ As in `pull_latest_from_table_or_query`, ARRAY_AGG(... LIMIT 1) lets BigQuery keep a single row
+ per group while aggregating, instead of sorting every partition or joining back to "base".
 */
 {{ featureview.name }}__cleaned AS (
-    SELECT base.*
-    FROM {{ featureview.name }}__base as base
-    INNER JOIN {{ featureview.name }}__latest
-    USING(
-        entity_row_unique_id,
-        event_timestamp
-        {% if featureview.created_timestamp_column %}
-            ,created_timestamp
-        {% endif %}
+    SELECT latest.*
+    FROM (
+        SELECT
+            ARRAY_AGG(
+                base
+                ORDER BY event_timestamp DESC{% if featureview.created_timestamp_column %}, created_timestamp DESC{% endif %}
+                LIMIT 1
+            )[OFFSET(0)] AS latest
+        FROM {{ featureview.name }}__base AS base
+        GROUP BY entity_row_unique_id
     )
 ){% if loop.last %}{% else %}, {% endif %}
 
@@ -629,3 +690,8 @@ LEFT JOIN (
 ) USING (entity_row_unique_id)
 {% endfor %}
 """
+
+# Parsing the template dominates the cost of rendering it, so compile it once at import time
+_POINT_IN_TIME_JOIN_TEMPLATE = Environment(
+    loader=BaseLoader(), auto_reload=False
+).from_string(source=SINGLE_FEATURE_VIEW_POINT_IN_TIME_JOIN)
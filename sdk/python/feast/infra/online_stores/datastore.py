@@ -11,23 +11,43 @@
 # WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
 # See the License for the specific language governing permissions and
 # limitations under the License.
+import collections.abc
 import itertools
+import threading
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor, as_completed
 from datetime import datetime
-from multiprocessing.pool import ThreadPool
-from typing import Any, Callable, Dict, Iterator, List, Optional, Sequence, Tuple, Union
+from typing import (
+    Any,
+    Callable,
+    Deque,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    Optional,
+    Sequence,
+    Tuple,
+    Union,
+)
 
 from pydantic import PositiveInt, StrictStr
 from pydantic.typing import Literal
+from pytz import utc
 
 from feast import Entity, FeatureTable, utils
 from feast.feature_view import FeatureView
-from feast.infra.online_stores.helpers import compute_entity_id
+from feast.infra.online_stores.helpers import compute_entity_ids
 from feast.infra.online_stores.online_store import OnlineStore
+from feast.protos.feast.storage.Datastore_pb2 import (
+    FeatureValueMap as FeatureValueMapProto,
+)
 from feast.protos.feast.types.EntityKey_pb2 import EntityKey as EntityKeyProto
 from feast.protos.feast.types.Value_pb2 import Value as ValueProto
 from feast.repo_config import FeastConfigBaseModel, RepoConfig
 
 try:
+    from google.api_core import retry
     from google.auth.exceptions import DefaultCredentialsError
     from google.cloud import datastore
 except ImportError as e:
@@ -36,9 +56,36 @@ except ImportError as e:
     raise FeastExtrasDependencyImportError("gcp", str(e))
 
 
-ProtoBatch = Sequence[
-    Tuple[EntityKeyProto, Dict[str, ValueProto], datetime, Optional[datetime]]
-]
+ProtoRow = Tuple[EntityKeyProto, Dict[str, ValueProto], datetime, Optional[datetime]]
+ProtoBatch = Sequence[ProtoRow]
+
+# Maximum number of keys Datastore accepts in a single Lookup request
+_LOOKUP_BATCH_SIZE = 1000
+
+# Maximum number of mutations Datastore accepts in a single Commit request
+_MAX_MUTATIONS_PER_COMMIT = 500
+
+# Datastore rejects Commit requests over 10 MiB; stay below that to leave room for request framing
+_MAX_COMMIT_BYTES = 9 * 1024 * 1024
+
+# Upper bound on what a row adds to a Commit request besides its serialized entity key and values
+# (key path, property names, timestamps)
+_ENTITY_OVERHEAD_BYTES = 1024
+
+# Stands in for a missing created_ts when picking the newest of several rows for one entity
+_MIN_TIMESTAMP = datetime.min.replace(tzinfo=utc)
+
+# Number of threads used to fetch and delete pages of rows when dropping a table
+_DELETE_CONCURRENCY = 8
+
+# Retry policy for minibatch commits, backing off exponentially on transient errors
+_WRITE_RETRY = retry.Retry(
+    predicate=retry.if_transient_error,
+    initial=0.1,
+    maximum=10.0,
+    multiplier=2.0,
+    deadline=60.0,
+)
 
 
 class DatastoreOnlineStoreConfig(FeastConfigBaseModel):
@@ -56,8 +103,9 @@ class DatastoreOnlineStoreConfig(FeastConfigBaseModel):
     write_concurrency: Optional[PositiveInt] = 40
     """ (optional) Amount of threads to use when writing batches of feature rows into Datastore"""
 
-    write_batch_size: Optional[PositiveInt] = 50
-    """ (optional) Amount of feature rows per batch being written into Datastore"""
+    write_batch_size: Optional[PositiveInt] = 500
+    """ (optional) Amount of feature rows per batch being written into Datastore (capped at 500). Batches of
+    large rows are split further to keep each commit under Datastore's 10 MiB request limit."""
 
 
 class DatastoreOnlineStore(OnlineStore):
@@ -67,6 +115,8 @@ class DatastoreOnlineStore(OnlineStore):
     """
 
     _client: Optional[datastore.Client] = None
+    _write_executor: Optional[ThreadPoolExecutor] = None
+    _init_lock = threading.Lock()
 
     def update(
         self,
@@ -127,18 +177,38 @@ class DatastoreOnlineStore(OnlineStore):
     def _get_client(self, online_config: DatastoreOnlineStoreConfig):
 
         if not self._client:
-            try:
-                self._client = datastore.Client(
-                    project=online_config.project_id, namespace=online_config.namespace,
-                )
-            except DefaultCredentialsError as e:
-                raise FeastProviderLoginError(
-                    str(e)
-                    + '\nIt may be necessary to run "gcloud auth application-default login" if you would like to use your '
-                    "local Google Cloud account "
-                )
+            # Writes run on a thread pool, so guard against building several clients at once
+            with self._init_lock:
+                if not self._client:
+                    try:
+                        self._client = datastore.Client(
+                            project=online_config.project_id,
+                            namespace=online_config.namespace,
+                        )
+                    except DefaultCredentialsError as e:
+                        raise FeastProviderLoginError(
+                            str(e)
+                            + '\nIt may be necessary to run "gcloud auth application-default login" if you would like to use your '
+                            "local Google Cloud account "
+                        )
         return self._client
 
+    def _get_write_executor(
+        self, online_config: DatastoreOnlineStoreConfig
+    ) -> ThreadPoolExecutor:
+        """
+        Returns the thread pool used to write minibatches. It is kept for the lifetime of the store so
+        that threads aren't spawned and torn down on every write.
+        """
+        if not self._write_executor:
+            with self._init_lock:
+                if not self._write_executor:
+                    self._write_executor = ThreadPoolExecutor(
+                        max_workers=online_config.write_concurrency,
+                        thread_name_prefix="feast-datastore-write",
+                    )
+        return self._write_executor
+
     def online_write_batch(
         self,
         config: RepoConfig,
@@ -153,22 +223,43 @@ class DatastoreOnlineStore(OnlineStore):
         assert isinstance(online_config, DatastoreOnlineStoreConfig)
         client = self._get_client(online_config)
 
-        write_concurrency = online_config.write_concurrency
-        write_batch_size = online_config.write_batch_size
+        executor = self._get_write_executor(online_config)
+        write_batch_size = min(
+            online_config.write_batch_size or _MAX_MUTATIONS_PER_COMMIT,
+            _MAX_MUTATIONS_PER_COMMIT,
+        )
         feast_project = config.project
 
-        pool = ThreadPool(processes=write_concurrency)
-        pool.map(
-            lambda b: self._write_minibatch(client, feast_project, table, b, progress),
-            self._to_minibatches(data, batch_size=write_batch_size),
-        )
+        futures = [
+            executor.submit(
+                self._write_minibatch,
+                client,
+                feast_project,
+                table,
+                batch,
+                progress,
+                config.entity_key_serialization_version,
+            )
+            for batch in self._to_minibatches(data, batch_size=write_batch_size)
+        ]
+        # Wait on the results so that exceptions raised in worker threads propagate
+        for future in as_completed(futures):
+            future.result()
 
     @staticmethod
-    def _to_minibatches(data: ProtoBatch, batch_size) -> Iterator[ProtoBatch]:
+    def _to_minibatches(
+        data: Union[ProtoBatch, Iterable[ProtoRow]], batch_size
+    ) -> Iterator[ProtoBatch]:
         """
         Split data into minibatches, making sure we stay under GCP datastore transaction size
         limits.
         """
+        if isinstance(data, collections.abc.Sequence):
+            # Slicing copies each batch in C rather than stepping through items in Python
+            for i in range(0, len(data), batch_size):
+                yield data[i : i + batch_size]
+            return
+
         iterable = iter(data)
 
         while True:
@@ -187,14 +278,49 @@ class DatastoreOnlineStore(OnlineStore):
             Tuple[EntityKeyProto, Dict[str, ValueProto], datetime, Optional[datetime]]
         ],
         progress: Optional[Callable[[int], Any]],
+        entity_key_serialization_version: int = 1,
     ):
-        entities = []
-        for entity_key, features, timestamp, created_ts in data:
-            document_id = compute_entity_id(entity_key)
-
+        document_ids = compute_entity_ids(
+            [row[0] for row in data], entity_key_serialization_version
+        )
+        make_tzaware = utils.make_tzaware
+
+        # A non-transactional commit rejects several mutations of the same entity, so only the
+        # newest row per entity is kept. Rows without created_ts lose ties on event_ts.
+        latest_rows: Dict[str, ProtoRow] = {}
+        for (entity_key, features, timestamp, created_ts), document_id in zip(
+            data, document_ids
+        ):
+            event_ts = make_tzaware(timestamp)
+            if created_ts is not None:
+                created_ts = make_tzaware(created_ts)
+
+            previous = latest_rows.get(document_id)
+            if previous is None or (event_ts, created_ts or _MIN_TIMESTAMP) >= (
+                previous[2],
+                previous[3] or _MIN_TIMESTAMP,
+            ):
+                latest_rows[document_id] = (entity_key, features, event_ts, created_ts)
+
+        # Rows are independent, so each commit is a plain non-transactional put: wrapping it in a
+        # transaction only adds a BeginTransaction round trip. Large rows can push 500 mutations
+        # past the commit request size limit, so a new commit is started before that happens.
+        commits: List[List[datastore.Entity]] = [[]]
+        commit_bytes = 0
+        table_name = table.name
+        for document_id, row in latest_rows.items():
+            entity_key, features, event_ts, created_ts = row
             key = client.key(
-                "Project", project, "Table", table.name, "Row", document_id,
+                "Project", project, "Table", table_name, "Row", document_id,
             )
+            key_bytes = entity_key.SerializeToString()
+            values = FeatureValueMapProto(values=features).SerializeToString()
+
+            entity_bytes = len(key_bytes) + len(values) + _ENTITY_OVERHEAD_BYTES
+            if commits[-1] and commit_bytes + entity_bytes > _MAX_COMMIT_BYTES:
+                commits.append([])
+                commit_bytes = 0
+            commit_bytes += entity_bytes
 
             entity = datastore.Entity(
                 key=key, exclude_from_indexes=("created_ts", "event_ts", "values")
@@ -202,22 +328,19 @@ class DatastoreOnlineStore(OnlineStore):
 
             entity.update(
                 dict(
-                    key=entity_key.SerializeToString(),
-                    values={k: v.SerializeToString() for k, v in features.items()},
-                    event_ts=utils.make_tzaware(timestamp),
-                    created_ts=(
-                        utils.make_tzaware(created_ts)
-                        if created_ts is not None
-                        else None
-                    ),
+                    key=key_bytes,
+                    values=values,
+                    event_ts=event_ts,
+                    created_ts=created_ts,
                 )
             )
-            entities.append(entity)
-        with client.transaction():
-            client.put_multi(entities)
+            commits[-1].append(entity)
+
+        for entities in commits:
+            client.put_multi(entities, retry=_WRITE_RETRY)
 
         if progress:
-            progress(len(entities))
+            progress(len(data))
 
     def online_read(
         self,
@@ -226,6 +349,22 @@ class DatastoreOnlineStore(OnlineStore):
         entity_keys: List[EntityKeyProto],
         requested_features: Optional[List[str]] = None,
     ) -> List[Tuple[Optional[datetime], Optional[Dict[str, ValueProto]]]]:
+        return list(
+            self.online_read_iter(config, table, entity_keys, requested_features)
+        )
+
+    def online_read_iter(
+        self,
+        config: RepoConfig,
+        table: Union[FeatureTable, FeatureView],
+        entity_keys: List[EntityKeyProto],
+        requested_features: Optional[List[str]] = None,
+    ) -> Iterator[Tuple[Optional[datetime], Optional[Dict[str, ValueProto]]]]:
+        """
+        Lazily yields the same results as `online_read`, in the order of `entity_keys`.
+        While the rows of one batch of keys are being consumed, the next batch is already
+        being looked up in the background.
+        """
 
         online_config = config.online_store
         assert isinstance(online_config, DatastoreOnlineStoreConfig)
@@ -233,34 +372,103 @@ class DatastoreOnlineStore(OnlineStore):
 
         feast_project = config.project
 
-        result: List[Tuple[Optional[datetime], Optional[Dict[str, ValueProto]]]] = []
-        for entity_key in entity_keys:
-            document_id = compute_entity_id(entity_key)
-            key = client.key(
+        keys: List[datastore.Key] = [
+            client.key(
                 "Project", feast_project, "Table", table.name, "Row", document_id
             )
-            value = client.get(key)
-            if value is not None:
-                res = {}
-                for feature_name, value_bin in value["values"].items():
-                    val = ValueProto()
-                    val.ParseFromString(value_bin)
-                    res[feature_name] = val
-                result.append((value["event_ts"], res))
-            else:
-                result.append((None, None))
-        return result
+            for document_id in compute_entity_ids(
+                entity_keys, config.entity_key_serialization_version
+            )
+        ]
+        batches = list(_chunks(keys, _LOOKUP_BATCH_SIZE))
+
+        for batch, values in zip(batches, _lookup_batches(client, batches)):
+            # Datastore returns found entities in arbitrary order and omits missing ones,
+            # so index them by key to restore the order of the requested entity keys.
+            values_by_key = {value.key: value for value in values}
+            for key in batch:
+                value = values_by_key.get(key)
+                if value is not None:
+                    yield value["event_ts"], _parse_values(value["values"])
+                else:
+                    yield None, None
+
+
+def _lookup_batches(
+    client, batches: List[List[datastore.Key]]
+) -> Iterator[List[datastore.Entity]]:
+    """
+    Look up batches of keys in order, prefetching the next batch while the current one is consumed.
+    """
+    if len(batches) <= 1:
+        # Nothing to overlap, so avoid spinning up a thread for the common single batch read
+        for batch in batches:
+            yield client.get_multi(batch)
+        return
+
+    with ThreadPoolExecutor(max_workers=1) as executor:
+        next_lookup = executor.submit(client.get_multi, batches[0])
+        for next_batch in batches[1:]:
+            values = next_lookup.result()
+            next_lookup = executor.submit(client.get_multi, next_batch)
+            yield values
+        yield next_lookup.result()
+
+
+def _parse_values(values: Union[bytes, Dict[str, bytes]]) -> Dict[str, ValueProto]:
+    """
+    Parse the feature values stored for a single row. Rows are written as one serialized
+    FeatureValueMap, but rows written by older versions hold one serialized Value per feature.
+    """
+    if isinstance(values, bytes):
+        return dict(FeatureValueMapProto.FromString(values).values)
+
+    return {
+        feature_name: ValueProto.FromString(value_bin)
+        for feature_name, value_bin in values.items()
+    }
+
+
+def _chunks(items: List[Any], size: int) -> Iterator[List[Any]]:
+    """
+    Split a list into consecutive chunks of at most `size` items.
+    """
+    for i in range(0, len(items), size):
+        yield items[i : i + size]
 
 
 def _delete_all_values(client, key) -> None:
     """
     Delete all data under the key path in datastore.
+
+    Pages of keys are fetched with a cursor, so the next page can be fetched while the keys of
+    the current page are being deleted.
     """
-    while True:
+
+    def fetch_page(cursor):
         query = client.query(kind="Row", ancestor=key)
-        entities = list(query.fetch(limit=1000))
-        if not entities:
-            return
+        query.keys_only()
+        iterator = query.fetch(limit=1000, start_cursor=cursor)
+        keys = [entity.key for entity in next(iterator.pages, [])]
+        return keys, iterator.next_page_token
+
+    with ThreadPoolExecutor(max_workers=_DELETE_CONCURRENCY) as executor:
+        deletes: Deque[Future] = deque()
+        next_page = executor.submit(fetch_page, None)
+        while True:
+            keys, cursor = next_page.result()
+            if keys and cursor is not None:
+                next_page = executor.submit(fetch_page, cursor)
+
+            for batch in _chunks(keys, _MAX_MUTATIONS_PER_COMMIT):
+                # Pages are fetched faster than they are deleted, so wait on the oldest delete
+                # rather than queueing the keys of the whole table in memory
+                if len(deletes) >= _DELETE_CONCURRENCY:
+                    deletes.popleft().result()
+                deletes.append(executor.submit(client.delete_multi, batch))
+            if not keys or cursor is None:
+                break
 
-        for entity in entities:
-            client.delete(entity.key)
+        # Wait on the deletes so that exceptions raised in worker threads propagate
+        for future in deletes:
+            future.result()
@@ -113,7 +113,9 @@ class DynamoDBOnlineStore(OnlineStore):
         table_instance = dynamodb_resource.Table(f"{config.project}.{table.name}")
         with table_instance.batch_writer() as batch:
             for entity_key, features, timestamp, created_ts in data:
-                entity_id = compute_entity_id(entity_key)
+                entity_id = compute_entity_id(
+                    entity_key, config.entity_key_serialization_version
+                )
                 batch.put_item(
                     Item={
                         "entity_id": entity_id,  # PartitionKey
@@ -141,7 +143,9 @@ class DynamoDBOnlineStore(OnlineStore):
         result: List[Tuple[Optional[datetime], Optional[Dict[str, ValueProto]]]] = []
         for entity_key in entity_keys:
             table_instance = dynamodb_resource.Table(f"{config.project}.{table.name}")
-            entity_id = compute_entity_id(entity_key)
+            entity_id = compute_entity_id(
+                entity_key, config.entity_key_serialization_version
+            )
             response = table_instance.get_item(Key={"entity_id": entity_id})
             value = response.get("Item")
 
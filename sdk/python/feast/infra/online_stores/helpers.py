@@ -1,6 +1,7 @@
+import base64
 import importlib
 import struct
-from typing import Any
+from typing import Any, Callable, List
 
 import mmh3
 
@@ -10,6 +11,13 @@ from feast.infra.online_stores.online_store import OnlineStore
 from feast.protos.feast.storage.Redis_pb2 import RedisKeyV2 as RedisKeyProto
 from feast.protos.feast.types.EntityKey_pb2 import EntityKey as EntityKeyProto
 
+try:
+    import xxhash
+except ImportError:
+    # Only needed for entity key serialization version 3; the Datastore and DynamoDB online
+    # stores using it install xxhash with the gcp and aws extras
+    xxhash = None  # type: ignore
+
 
 def get_online_store_from_config(online_store_config: Any,) -> OnlineStore:
     """Get the offline store from offline store config"""
@@ -56,10 +64,62 @@ def _mmh3(key: str):
     return bytes.fromhex(struct.pack("<Q", key_hash).hex()[:8])
 
 
-def compute_entity_id(entity_key: EntityKeyProto) -> str:
+def _hex_entity_id(serialized_entity_key: bytes) -> str:
+    return mmh3.hash_bytes(serialized_entity_key).hex()
+
+
+def _base64_entity_id(serialized_entity_key: bytes) -> str:
+    return (
+        base64.urlsafe_b64encode(mmh3.hash_bytes(serialized_entity_key))
+        .rstrip(b"=")
+        .decode("ascii")
+    )
+
+
+def _xxh3_entity_id(serialized_entity_key: bytes) -> str:
+    return xxhash.xxh3_128_hexdigest(serialized_entity_key)
+
+
+def _encode_entity_id(entity_key_serialization_version: int) -> Callable[[bytes], str]:
+    """
+    Get the function turning a serialized entity key into an entity id for the given serialization version.
+    """
+    if entity_key_serialization_version == 1:
+        return _hex_entity_id
+    elif entity_key_serialization_version == 2:
+        return _base64_entity_id
+    elif entity_key_serialization_version == 3:
+        if xxhash is None:
+            raise errors.FeastExtrasDependencyImportError(
+                "gcp",
+                "xxhash is required for entity_key_serialization_version 3 "
+                "(it ships with the gcp and aws extras)",
+            )
+        return _xxh3_entity_id
+    else:
+        raise ValueError(
+            f"Unsupported entity key serialization version: {entity_key_serialization_version}"
+        )
+
+
+def compute_entity_id(
+    entity_key: EntityKeyProto, entity_key_serialization_version: int = 1
+) -> str:
     """
     Compute Entity id given Feast Entity Key for online stores.
     Remember that Entity here refers to `EntityKeyProto` which is used in some online stores to encode the keys.
     It has nothing to do with the Entity concept we have in Feast.
     """
-    return mmh3.hash_bytes(serialize_entity_key(entity_key)).hex()
+    encode = _encode_entity_id(entity_key_serialization_version)
+    return encode(serialize_entity_key(entity_key))
+
+
+def compute_entity_ids(
+    entity_keys: List[EntityKeyProto], entity_key_serialization_version: int = 1
+) -> List[str]:
+    """
+    Compute Entity ids for a batch of Feast Entity Keys. Equivalent to calling `compute_entity_id`
+    on each key, but avoids the per-key function call and attribute lookups in hot loops.
+    """
+    encode = _encode_entity_id(entity_key_serialization_version)
+    return [encode(serialize_entity_key(k)) for k in entity_keys]
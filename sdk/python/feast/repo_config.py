@@ -4,7 +4,7 @@ from typing import Any
 import yaml
 from pydantic import BaseModel, StrictInt, StrictStr, ValidationError, root_validator
 from pydantic.error_wrappers import ErrorWrapper
-from pydantic.typing import Dict, Optional, Union
+from pydantic.typing import Dict, Literal, Optional, Union
 
 from feast.importer import get_class_from_type
 from feast.usage import log_exceptions
@@ -78,6 +78,14 @@ class RepoConfig(FeastBaseModel):
 
     repo_path: Optional[Path] = None
 
+    entity_key_serialization_version: Literal[1, 2, 3] = 1
+    """ int: Version of the scheme used to derive row ids from entity keys in the Datastore and DynamoDB online
+        stores (Redis and SQLite key rows differently and ignore it). Version 1 encodes the murmur3 hash of the
+        entity key as hex, version 2 as unpadded url-safe base64 which yields shorter keys. Version 3 encodes the
+        faster xxh3_128 hash as hex, and requires xxhash from the gcp or aws extras.
+        Changing the version changes the row ids, so existing online data has to be re-materialized.
+    """
+
     def __init__(self, **data: Any):
         super().__init__(**data)
         if isinstance(self.online_store, Dict):
@@ -5,7 +5,4 @@ from pytz import utc
 
 def make_tzaware(t: datetime) -> datetime:
     """ We assume tz-naive datetimes are UTC """
-    if t.tzinfo is None:
-        return t.replace(tzinfo=utc)
-    else:
-        return t
+    return t.replace(tzinfo=utc) if t.tzinfo is None else t
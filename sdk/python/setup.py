@@ -65,6 +65,7 @@ GCP_REQUIRED = [
     "google-cloud-datastore>=2.1.*",
     "google-cloud-storage>=1.20.*",
     "google-cloud-core==1.4.*",
+    "xxhash>=2.0.0",
 ]
 
 REDIS_REQUIRED = [
@@ -73,6 +74,7 @@ REDIS_REQUIRED = [
 
 AWS_REQUIRED = [
     "boto3==1.17.*",
+    "xxhash>=2.0.0",
 ]
 
 CI_REQUIRED = [
@@ -109,6 +111,7 @@ CI_REQUIRED = [
     "google-cloud-core==1.4.*",
     "redis-py-cluster==2.1.2",
     "boto3==1.17.*",
+    "xxhash>=2.0.0",
 ]
 
 
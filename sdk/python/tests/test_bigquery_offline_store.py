@@ -0,0 +1,132 @@
+from datetime import date
+from unittest import mock
+
+import pandas as pd
+import pyarrow
+import pytest
+
+from feast.infra.offline_stores import bigquery
+from feast.infra.offline_stores.bigquery import (
+    BigQueryOfflineStore,
+    BigQueryOfflineStoreConfig,
+)
+
+
+@pytest.fixture
+def retrieval_job():
+    client = mock.MagicMock()
+    client.project = "test-project"
+    client.query.return_value.exception.return_value = None
+
+    config = mock.MagicMock()
+    config.project = "test"
+    config.offline_store = BigQueryOfflineStoreConfig()
+
+    with mock.patch.object(
+        bigquery, "_get_bigquery_client", return_value=client
+    ), mock.patch.object(
+        bigquery, "_upload_entity_df_into_bigquery"
+    ), mock.patch.object(
+        bigquery, "_get_join_keys", return_value=set()
+    ), mock.patch.object(
+        bigquery,
+        "_infer_event_timestamp_from_bigquery_query",
+        return_value="event_timestamp",
+    ), mock.patch.object(
+        bigquery, "_assert_expected_columns_in_bigquery"
+    ), mock.patch.object(
+        bigquery, "get_feature_view_query_context", return_value=[]
+    ), mock.patch.object(
+        bigquery, "build_point_in_time_query", return_value="SELECT 1"
+    ), mock.patch.object(
+        bigquery, "block_until_done"
+    ), mock.patch.object(
+        bigquery, "_get_bigquery_storage_client"
+    ):
+        job = BigQueryOfflineStore.get_historical_features(
+            config=config,
+            feature_views=[],
+            feature_refs=[],
+            entity_df=pd.DataFrame(),
+            registry=mock.MagicMock(),
+            project="test",
+        )
+        yield job, client
+
+
+def test_get_historical_features_does_not_submit_query(retrieval_job):
+    job, client = retrieval_job
+
+    assert job.to_sql() == "SELECT 1"
+    client.query.assert_not_called()
+
+
+def test_to_bigquery_submits_single_query(retrieval_job):
+    job, client = retrieval_job
+
+    job.to_bigquery()
+    assert client.query.call_count == 1
+
+
+def test_to_bigquery_dry_run_submits_single_query(retrieval_job):
+    job, client = retrieval_job
+
+    job.to_bigquery(job_config=bigquery.bigquery.QueryJobConfig(dry_run=True))
+    assert client.query.call_count == 1
+    assert client.query.call_args[1]["job_config"].dry_run
+
+
+def test_results_share_single_query(retrieval_job):
+    job, client = retrieval_job
+
+    job.to_arrow()
+    job.to_arrow()
+    assert client.query.call_count == 1
+
+
+def test_failed_query_is_submitted_again(retrieval_job):
+    job, client = retrieval_job
+    client.query.return_value.to_arrow.side_effect = [RuntimeError("quota"), None]
+
+    with pytest.raises(RuntimeError):
+        job.to_arrow()
+    job.to_arrow()
+    assert client.query.call_count == 2
+
+
+def test_to_df_keeps_bigquery_dtypes(retrieval_job):
+    # BigQuery's to_dataframe maps nullable columns to pandas extension dtypes, which a plain
+    # Arrow to pandas conversion turns into float64 and object columns
+    pytest.importorskip("db_dtypes")
+    job, client = retrieval_job
+
+    schema = [
+        bigquery.bigquery.SchemaField("driver_id", "INTEGER"),
+        bigquery.bigquery.SchemaField("active", "BOOLEAN"),
+        bigquery.bigquery.SchemaField("conv_rate", "FLOAT"),
+        bigquery.bigquery.SchemaField("day", "DATE"),
+    ]
+    table = pyarrow.table(
+        {
+            "driver_id": pyarrow.array([1, None], pyarrow.int64()),
+            "active": pyarrow.array([True, None]),
+            "conv_rate": pyarrow.array([0.5, None]),
+            "day": pyarrow.array([date(2021, 1, 1), None], pyarrow.date32()),
+        }
+    )
+    rows = bigquery.bigquery.table.RowIterator(
+        client=None, api_request=None, path=None, schema=schema
+    )
+    query_job = client.query.return_value
+    query_job.to_arrow.return_value = table
+    query_job.to_dataframe.side_effect = rows.to_dataframe
+
+    with mock.patch.object(rows, "to_arrow", return_value=table):
+        df = job.to_df()
+
+    assert df.dtypes.astype(str).to_dict() == {
+        "driver_id": "Int64",
+        "active": "boolean",
+        "conv_rate": "float64",
+        "day": "dbdate",
+    }
@@ -0,0 +1,155 @@
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from unittest import mock
+
+from feast.infra.online_stores import datastore
+from feast.infra.online_stores.datastore import (
+    DatastoreOnlineStore,
+    DatastoreOnlineStoreConfig,
+    _delete_all_values,
+    _parse_values,
+)
+from feast.protos.feast.storage.Datastore_pb2 import (
+    FeatureValueMap as FeatureValueMapProto,
+)
+from feast.protos.feast.types.EntityKey_pb2 import EntityKey as EntityKeyProto
+from feast.protos.feast.types.Value_pb2 import Value as ValueProto
+
+FEATURES = {
+    "conv_rate": ValueProto(double_val=0.5),
+    "trips_today": ValueProto(int64_val=7),
+    "name": ValueProto(string_val="driver"),
+}
+
+
+def test_parse_values_reads_feature_value_map():
+    values = FeatureValueMapProto(values=FEATURES).SerializeToString()
+
+    assert _parse_values(values) == FEATURES
+
+
+def test_parse_values_reads_legacy_per_feature_values():
+    # Rows written before FeatureValueMap was introduced store one serialized Value per feature
+    legacy_values = {k: v.SerializeToString() for k, v in FEATURES.items()}
+
+    assert _parse_values(legacy_values) == FEATURES
+    assert _parse_values(legacy_values) == _parse_values(
+        FeatureValueMapProto(values=FEATURES).SerializeToString()
+    )
+
+
+def test_to_minibatches_sequence_and_iterator_match():
+    rows = [
+        (
+            EntityKeyProto(
+                join_keys=["driver_id"], entity_values=[ValueProto(int64_val=i)]
+            ),
+            FEATURES,
+            datetime(2021, 1, 1),
+            None,
+        )
+        for i in range(5)
+    ]
+
+    from_sequence = [
+        list(batch) for batch in DatastoreOnlineStore._to_minibatches(rows, 2)
+    ]
+    from_iterator = [
+        list(batch) for batch in DatastoreOnlineStore._to_minibatches(iter(rows), 2)
+    ]
+
+    assert from_sequence == from_iterator
+    assert from_sequence == [rows[0:2], rows[2:4], rows[4:5]]
+
+
+def _rows(n):
+    return [
+        (
+            EntityKeyProto(
+                join_keys=["driver_id"], entity_values=[ValueProto(int64_val=i)]
+            ),
+            {"trips_today": ValueProto(int64_val=i)},
+            datetime(2021, 1, 1, i),
+            None,
+        )
+        for i in range(n)
+    ]
+
+
+def _write_with_fake_client(rows):
+    client = mock.MagicMock()
+    client.key.side_effect = lambda *path: path
+    config = mock.MagicMock()
+    config.project = "test"
+    config.online_store = DatastoreOnlineStoreConfig()
+    config.entity_key_serialization_version = 1
+    table = mock.MagicMock()
+    table.name = "driver_stats"
+
+    store = DatastoreOnlineStore()
+    store._client = client
+    store.online_write_batch(config, table, rows, None)
+    return client
+
+
+def test_online_write_batch_writes_each_entity_once():
+    rows = _rows(3)
+    older = (rows[0][0], FEATURES, datetime(2020, 1, 1), None)
+
+    client = _write_with_fake_client([rows[0], older, rows[0]] + rows[1:])
+
+    # Datastore rejects a commit that mutates the same entity twice
+    (entities,), _ = client.put_multi.call_args
+    keys = [entity.key for entity in entities]
+    assert client.put_multi.call_count == 1
+    assert len(keys) == len(set(keys)) == 3
+    assert _parse_values(entities[0]["values"]) == rows[0][1]
+
+
+def test_online_write_batch_splits_commits_by_size():
+    rows = _rows(5)
+
+    # Room for two rows per commit
+    with mock.patch.object(datastore, "_MAX_COMMIT_BYTES", 2500):
+        client = _write_with_fake_client(rows)
+
+    commits = [call[0][0] for call in client.put_multi.call_args_list]
+    assert [len(entities) for entities in commits] == [2, 2, 1]
+
+
+def test_delete_all_values_bounds_outstanding_deletes():
+    pages = [[mock.Mock(key=(page, i)) for i in range(1000)] for page in range(10)]
+
+    def fetch(limit, start_cursor):
+        page = start_cursor or 0
+        iterator = mock.Mock()
+        iterator.pages = iter([pages[page]])
+        iterator.next_page_token = page + 1 if page + 1 < len(pages) else None
+        return iterator
+
+    deleted = []
+
+    def delete_multi(keys):
+        time.sleep(0.01)
+        deleted.extend(keys)
+
+    client = mock.MagicMock()
+    client.query.return_value.fetch.side_effect = fetch
+    client.delete_multi.side_effect = delete_multi
+
+    futures = []
+    outstanding = []
+
+    class RecordingExecutor(ThreadPoolExecutor):
+        def submit(self, *args, **kwargs):
+            futures.append(super().submit(*args, **kwargs))
+            outstanding.append(sum(not future.done() for future in futures))
+            return futures[-1]
+
+    with mock.patch.object(datastore, "ThreadPoolExecutor", RecordingExecutor):
+        _delete_all_values(client, "table_key")
+
+    assert len(deleted) == 10000
+    # At most _DELETE_CONCURRENCY deletes plus the page fetch are in flight at any time
+    assert max(outstanding) <= datastore._DELETE_CONCURRENCY + 1
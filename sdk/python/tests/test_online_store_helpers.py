@@ -0,0 +1,44 @@
+from unittest import mock
+
+import pytest
+
+from feast.errors import FeastExtrasDependencyImportError
+from feast.infra.online_stores import helpers
+from feast.infra.online_stores.helpers import compute_entity_id, compute_entity_ids
+from feast.protos.feast.types.EntityKey_pb2 import EntityKey as EntityKeyProto
+from feast.protos.feast.types.Value_pb2 import Value as ValueProto
+
+ENTITY_KEY = EntityKeyProto(
+    join_keys=["driver_id"], entity_values=[ValueProto(int64_val=1001)]
+)
+
+
+def test_compute_entity_id_version_1_is_unchanged():
+    # Rows written before entity key serialization versions existed must keep resolving
+    assert compute_entity_id(ENTITY_KEY) == "4502dfea47294cccf23a78c07a9fb3e5"
+    assert compute_entity_id(ENTITY_KEY, 1) == "4502dfea47294cccf23a78c07a9fb3e5"
+
+
+def test_compute_entity_id_version_2():
+    assert compute_entity_id(ENTITY_KEY, 2) == "RQLf6kcpTMzyOnjAep-z5Q"
+
+
+def test_compute_entity_id_version_3():
+    assert compute_entity_id(ENTITY_KEY, 3) == "f5579c0fb080ddf50696e3c75203edec"
+
+
+def test_compute_entity_id_version_3_requires_xxhash():
+    with mock.patch.object(helpers, "xxhash", None):
+        with pytest.raises(FeastExtrasDependencyImportError):
+            compute_entity_id(ENTITY_KEY, 3)
+
+
+def test_compute_entity_ids_matches_compute_entity_id():
+    other_key = EntityKeyProto(
+        join_keys=["customer_id"], entity_values=[ValueProto(string_val="abc")]
+    )
+    for version in (1, 2, 3):
+        assert compute_entity_ids([ENTITY_KEY, other_key], version) == [
+            compute_entity_id(ENTITY_KEY, version),
+            compute_entity_id(other_key, version),
+        ]
@@ -91,6 +91,35 @@ def test_gcp_config():
     )
 
 
+def test_entity_key_serialization_version():
+    c = _test_config(
+        dedent(
+            """
+        project: foo
+        registry: gs://registry.db
+        provider: gcp
+        entity_key_serialization_version: 2
+        """
+        ),
+        expect_error=None,
+    )
+    assert c.entity_key_serialization_version == 2
+
+
+def test_bad_entity_key_serialization_version():
+    _test_config(
+        dedent(
+            """
+        project: foo
+        registry: gs://registry.db
+        provider: gcp
+        entity_key_serialization_version: 4
+        """
+        ),
+        expect_error="entity_key_serialization_version\n  unexpected value",
+    )
+
+
 def test_extra_field():
     _test_config(
         dedent(